@@ -1,8 +1,21 @@
+import os
+
+# Cap TF/OpenMP thread pools before tensorflow is imported (via
+# src.model_handler below); these env vars are only read at import time.
+# Oversubscription between TF intra-op threads and server workers makes
+# CPU kernels slower, not faster.
+_num_threads = os.environ.get('NUM_THREADS', '4')
+os.environ.setdefault('OMP_NUM_THREADS', _num_threads)
+os.environ.setdefault('TF_NUM_INTRAOP_THREADS', _num_threads)
+os.environ.setdefault('TF_NUM_INTEROP_THREADS', '1')
+
 from flask import Flask, request, jsonify
+from flask.wrappers import Request
 from flask_cors import CORS
-import os
+import io
 import logging
-from src.model_handler import ModelHandler
+import numpy as np
+from src.model_handler import get_handler
 from src.config import Config
 from src.utils import setup_logging
 
@@ -10,16 +23,32 @@ from src.utils import setup_logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Load the model at import time so gunicorn --preload allocates the
+# weights once in the master process; forked workers share them
+# copy-on-write instead of each loading a ~500MB model.
+model_handler = get_handler()
+
+class InMemoryUploadRequest(Request):
+    """Request that parses file uploads into memory
+
+    Werkzeug's default stream factory spills uploads larger than 500KB
+    to a temp file, adding filesystem round-trips to every prediction.
+    Uploads are already capped by MAX_CONTENT_LENGTH (16MB), so keeping
+    them in a BytesIO is safe and avoids the tmpfile I/O entirely.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type,
+                         filename=None, content_length=None):
+        return io.BytesIO()
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.request_class = InMemoryUploadRequest
 
     # Enable CORS for frontend communication
     CORS(app)
 
-    # Initialize model handler
-    model_handler = ModelHandler()
-
     @app.route('/health', methods=['GET'])
     def health_check():
         """Health check endpoint"""
@@ -48,6 +77,36 @@ def create_app():
             logger.error(f"Prediction error: {str(e)}")
             return jsonify({'error': 'Internal server error'}), 500
 
+    @app.route('/predict_raw', methods=['POST'])
+    def predict_raw():
+        """Raw-tensor prediction endpoint
+
+        Accepts an application/octet-stream body holding the raw bytes
+        of a (height, width, 3) uint8 RGB tensor already at the model
+        input size. Internal clients and benchmarks that hold decoded
+        pixels can skip image encoding on their side and the whole
+        decode/resize pipeline on ours, isolating inference cost.
+        """
+        try:
+            shape = Config.MODEL_INPUT_SIZE + (3,)
+            expected_bytes = shape[0] * shape[1] * shape[2]
+            data = request.get_data()
+            if len(data) != expected_bytes:
+                return jsonify({
+                    'error': f'Expected {expected_bytes} bytes of uint8 '
+                             f'RGB data with shape {shape}'
+                }), 400
+
+            # frombuffer is a zero-copy view over the request body
+            pixels = np.frombuffer(data, dtype=np.uint8).reshape(shape)
+            prediction_result = model_handler.predict_array(pixels)
+
+            return jsonify(prediction_result)
+
+        except Exception as e:
+            logger.error(f"Raw prediction error: {str(e)}")
+            return jsonify({'error': 'Internal server error'}), 500
+
     @app.route('/model/info', methods=['GET'])
     def model_info():
         """Get model information"""
@@ -55,7 +114,19 @@ def create_app():
 
     return app
 
+# Optional ASGI entry point: `uvicorn app:asgi_app --workers 4` serves
+# requests concurrently, letting GIL-releasing PIL/numpy preprocessing
+# overlap with inference (and feeding the dynamic batcher). Requires
+# the optional asgiref dependency.
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    asgi_app = WsgiToAsgi(create_app())
+except ImportError:
+    asgi_app = None
+
 if __name__ == '__main__':
     app = create_app()
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    # threaded=True so the dev server can overlap requests; production
+    # should use gunicorn (see Dockerfile) or uvicorn with asgi_app
+    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
\ No newline at end of file
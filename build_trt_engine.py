@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Script to build a TensorRT engine (.plan) from the cached Keras model
+
+Exports the model to ONNX via tf2onnx, then builds an FP16 engine
+(optionally INT8 with a MinMax calibrator over sample images). The
+resulting .plan file is picked up automatically by ModelHandler at
+startup and served through the TensorRT runtime instead of Keras.
+
+Requires: tf2onnx, tensorrt, pycuda (GPU hosts only)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import tf_keras as keras
+
+from src.config import Config
+
+
+def export_onnx(model, onnx_path: Path):
+    """Export the Keras model to ONNX"""
+    import tf2onnx
+    import tensorflow as tf
+
+    input_shape = (1,) + Config.MODEL_INPUT_SIZE + (3,)
+    spec = (tf.TensorSpec(input_shape, tf.float32, name='input'),)
+
+    print(f"Exporting ONNX model to: {onnx_path}")
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=13,
+                               output_path=str(onnx_path))
+
+
+class MinMaxCalibrator:
+    """INT8 MinMax calibrator fed with preprocessed sample images"""
+
+    def __new__(cls, *args, **kwargs):
+        import tensorrt as trt
+
+        class _Calibrator(trt.IInt8MinMaxCalibrator):
+            def __init__(self, sample_dir: Path, cache_path: Path):
+                super().__init__()
+                import pycuda.driver as cuda
+                from src.utils import preprocess_image_vgg16
+
+                self.cache_path = cache_path
+                self.batches = []
+                for image_path in sorted(sample_dir.glob('*'))[:500]:
+                    with open(image_path, 'rb') as f:
+                        image_array = preprocess_image_vgg16(f, Config.MODEL_INPUT_SIZE)
+                    self.batches.append(np.expand_dims(image_array, axis=0))
+                self.index = 0
+                self.device_input = cuda.mem_alloc(self.batches[0].nbytes)
+                self._cuda = cuda
+
+            def get_batch_size(self):
+                return 1
+
+            def get_batch(self, names):
+                if self.index >= len(self.batches):
+                    return None
+                self._cuda.memcpy_htod(self.device_input, self.batches[self.index])
+                self.index += 1
+                return [int(self.device_input)]
+
+            def read_calibration_cache(self):
+                if self.cache_path.exists():
+                    return self.cache_path.read_bytes()
+                return None
+
+            def write_calibration_cache(self, cache):
+                self.cache_path.write_bytes(cache)
+
+        return _Calibrator(*args, **kwargs)
+
+
+def build_engine(onnx_path: Path, plan_path: Path, int8_samples: Path = None):
+    """Build a TensorRT engine from the ONNX model with FP16 (and optional INT8)"""
+    import tensorrt as trt
+
+    trt_logger = trt.Logger(trt.Logger.INFO)
+    builder = trt.Builder(trt_logger)
+    network = builder.create_network(
+        1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH))
+    parser = trt.OnnxParser(network, trt_logger)
+
+    print(f"Parsing ONNX model: {onnx_path}")
+    if not parser.parse(onnx_path.read_bytes()):
+        for i in range(parser.num_errors):
+            print(f"  ONNX parse error: {parser.get_error(i)}")
+        return False
+
+    config = builder.create_builder_config()
+    config.set_memory_pool_limit(trt.MemoryPoolType.WORKSPACE, 1 << 30)
+
+    if builder.platform_has_fast_fp16:
+        config.set_flag(trt.BuilderFlag.FP16)
+        print("FP16 enabled")
+
+    if int8_samples is not None and builder.platform_has_fast_int8:
+        config.set_flag(trt.BuilderFlag.INT8)
+        config.int8_calibrator = MinMaxCalibrator(
+            int8_samples, plan_path.with_suffix('.calib'))
+        print(f"INT8 enabled with MinMax calibration from: {int8_samples}")
+
+    print("Building engine (this can take a few minutes)...")
+    engine_bytes = builder.build_serialized_network(network, config)
+    if engine_bytes is None:
+        print("Engine build failed")
+        return False
+
+    plan_path.write_bytes(engine_bytes)
+    print(f"Engine saved to: {plan_path}")
+    return True
+
+
+def main():
+    """Main function"""
+    print("VGG16 Cat vs Dog Classifier TensorRT Engine Builder")
+    print("=" * 50)
+
+    model_path = Config.get_model_path()
+    if not model_path.exists():
+        print(f"Keras model not found at: {model_path}")
+        print("Run download_model.py first to fetch the model.")
+        sys.exit(1)
+
+    model = keras.models.load_model(str(model_path))
+
+    onnx_path = model_path.parent / (model_path.name + '.onnx')
+    plan_path = model_path.parent / (model_path.name + '.plan')
+
+    int8_samples = None
+    if len(sys.argv) > 1:
+        int8_samples = Path(sys.argv[1])
+        print(f"Using INT8 calibration samples from: {int8_samples}")
+
+    export_onnx(model, onnx_path)
+
+    if build_engine(onnx_path, plan_path, int8_samples):
+        print("\nEngine build completed successfully!")
+        print("Restart the Flask app to serve inference through TensorRT.")
+    else:
+        print("\nEngine build failed. Please check the error messages above.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,9 +29,11 @@ def download_model():
         models_dir = Path("models")
         models_dir.mkdir(exist_ok=True)
 
-        # Save model locally
+        # Save model locally (skip when a previous run already saved it;
+        # the download above is served from the Hugging Face cache)
         model_path = models_dir / "cats_vs_dogs_classifier"
-        model.save(str(model_path))
+        if not (model_path / "saved_model.pb").exists():
+            model.save(str(model_path))
 
         print(f"Model downloaded and saved to: {model_path}")
         print(f"Model input shape: {model.input_shape}")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Script to quantize the VGG16 Cat vs Dog Classifier to an INT8 TFLite model
+
+Converts the cached Keras model with tf.lite.TFLiteConverter using a
+representative dataset for full INT8 quantization. The resulting
+.tflite file is picked up automatically by ModelHandler at startup and
+executed through the TFLite interpreter (XNNPACK), giving 2-4x the
+matmul throughput of FP32 on modern x86 plus a 4x smaller model file.
+
+Usage: python quantize_model.py [sample_images_dir]
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+import tf_keras as keras
+
+from src.config import Config
+from src.utils import preprocess_image_vgg16
+
+
+def representative_dataset(sample_dir):
+    """Build a representative dataset generator for INT8 calibration
+
+    Uses preprocessed sample images when a directory is given; falls
+    back to random data in the VGG16 preprocessing range (sufficient to
+    calibrate, though real images give better activation ranges).
+    """
+    input_shape = (1,) + Config.MODEL_INPUT_SIZE + (3,)
+
+    def generator():
+        image_paths = sorted(sample_dir.glob('*'))[:500] if sample_dir else []
+        if image_paths:
+            for image_path in image_paths:
+                with open(image_path, 'rb') as f:
+                    image_array = preprocess_image_vgg16(f, Config.MODEL_INPUT_SIZE)
+                yield [np.expand_dims(image_array, axis=0).astype(np.float32)]
+        else:
+            for _ in range(100):
+                yield [np.random.uniform(-128.0, 128.0, input_shape).astype(np.float32)]
+
+    return generator
+
+
+def quantize_model(sample_dir=None):
+    """Convert the cached Keras model to an INT8 TFLite flatbuffer"""
+
+    model_path = Config.get_model_path()
+    if not model_path.exists():
+        print(f"Keras model not found at: {model_path}")
+        print("Run download_model.py first to fetch the model.")
+        return False
+
+    print(f"Loading Keras model from: {model_path}")
+    model = keras.models.load_model(str(model_path))
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset(sample_dir)
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    print("Converting to INT8 TFLite (this can take a few minutes)...")
+    tflite_model = converter.convert()
+
+    tflite_path = model_path.parent / (model_path.name + '.tflite')
+    tflite_path.write_bytes(tflite_model)
+
+    original_mb = sum(f.stat().st_size for f in model_path.rglob('*') if f.is_file()) / (1024 * 1024)
+    quantized_mb = len(tflite_model) / (1024 * 1024)
+    print(f"Quantized model saved to: {tflite_path}")
+    print(f"Size: {original_mb:.1f}MB -> {quantized_mb:.1f}MB")
+
+    return True
+
+
+def main():
+    """Main function"""
+    print("VGG16 Cat vs Dog Classifier INT8 Quantizer")
+    print("=" * 50)
+
+    sample_dir = None
+    if len(sys.argv) > 1:
+        sample_dir = Path(sys.argv[1])
+        print(f"Using calibration samples from: {sample_dir}")
+    else:
+        print("No sample directory given; calibrating with random data.")
+
+    if quantize_model(sample_dir):
+        print("\nQuantization completed successfully!")
+        print("Restart the Flask app to serve inference through TFLite.")
+    else:
+        print("\nQuantization failed. Please check the error messages above.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
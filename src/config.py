@@ -1,6 +1,10 @@
 import os
 from pathlib import Path
 
+# Project root, computed once at import; the path helpers below would
+# otherwise rebuild (and re-stat) the Path chain on every call
+_BASE_PATH = Path(__file__).parent.parent
+
 class Config:
     """Application configuration"""
 
@@ -26,14 +30,21 @@ class Config:
     BATCH_SIZE = int(os.environ.get('BATCH_SIZE', '1'))
     NUM_THREADS = int(os.environ.get('NUM_THREADS', '4'))
 
+    # Precomputed absolute paths (class attributes are resolved once at
+    # import rather than per call)
+    _model_path = None
+    _classes_path = None
+
     @staticmethod
     def get_model_path():
         """Get absolute path to model file"""
-        base_path = Path(__file__).parent.parent
-        return base_path / Config.MODEL_PATH
+        if Config._model_path is None:
+            Config._model_path = _BASE_PATH / Config.MODEL_PATH
+        return Config._model_path
 
     @staticmethod
     def get_classes_path():
         """Get absolute path to classes file"""
-        base_path = Path(__file__).parent.parent
-        return base_path / Config.MODEL_CLASSES_FILE
\ No newline at end of file
+        if Config._classes_path is None:
+            Config._classes_path = _BASE_PATH / Config.MODEL_CLASSES_FILE
+        return Config._classes_path
\ No newline at end of file
@@ -0,0 +1,92 @@
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# TensorRT and PyCUDA are optional GPU-only dependencies. Import them lazily
+# so the Flask app still runs on CPU-only hosts (e.g. the Docker demo image).
+try:
+    import tensorrt as trt
+    import pycuda.autoinit  # noqa: F401 - creates the CUDA context
+    import pycuda.driver as cuda
+    TRT_AVAILABLE = True
+except ImportError:
+    trt = None
+    cuda = None
+    TRT_AVAILABLE = False
+
+
+class TRTEngine:
+    """Runs inference through a serialized TensorRT engine (.plan file)
+
+    The engine is expected to be built offline from the Keras model
+    (see build_trt_engine.py) with FP16 enabled. At runtime we hold a
+    single execution context plus pinned host and device buffers sized
+    to the fixed (1, H, W, 3) input, so each prediction is just
+    host-to-device copy -> execute -> device-to-host copy.
+    """
+
+    def __init__(self, plan_path: Path):
+        if not TRT_AVAILABLE:
+            raise RuntimeError("TensorRT or PyCUDA is not installed")
+
+        self.plan_path = plan_path
+        trt_logger = trt.Logger(trt.Logger.WARNING)
+
+        with open(plan_path, 'rb') as f, trt.Runtime(trt_logger) as runtime:
+            self.engine = runtime.deserialize_cuda_engine(f.read())
+
+        if self.engine is None:
+            raise RuntimeError(f"Failed to deserialize TensorRT engine: {plan_path}")
+
+        self.context = self.engine.create_execution_context()
+        self.stream = cuda.Stream()
+
+        # Allocate pinned host buffers and device buffers once; shapes are
+        # static for this model so they can be reused for every request
+        input_shape = tuple(self.engine.get_binding_shape(0))
+        output_shape = tuple(self.engine.get_binding_shape(1))
+
+        self.host_input = cuda.pagelocked_empty(input_shape, dtype=np.float32)
+        self.host_output = cuda.pagelocked_empty(output_shape, dtype=np.float32)
+        self.device_input = cuda.mem_alloc(self.host_input.nbytes)
+        self.device_output = cuda.mem_alloc(self.host_output.nbytes)
+        self.bindings = [int(self.device_input), int(self.device_output)]
+
+        logger.info(f"TensorRT engine loaded: {plan_path} "
+                    f"(input {input_shape}, output {output_shape})")
+
+    def infer(self, image_batch: np.ndarray) -> np.ndarray:
+        """Run a forward pass and return the raw output array"""
+        np.copyto(self.host_input, image_batch.astype(np.float32, copy=False))
+
+        cuda.memcpy_htod_async(self.device_input, self.host_input, self.stream)
+        self.context.execute_async_v2(bindings=self.bindings,
+                                      stream_handle=self.stream.handle)
+        cuda.memcpy_dtoh_async(self.host_output, self.device_output, self.stream)
+        self.stream.synchronize()
+
+        return np.array(self.host_output, copy=True)
+
+
+def load_engine(plan_path: Path) -> Optional[TRTEngine]:
+    """Load a TensorRT engine if the runtime and the .plan file are available
+
+    Returns None (with a log message) instead of raising, so callers can
+    fall back to the Keras model on CPU-only hosts.
+    """
+    if not plan_path.exists():
+        return None
+
+    if not TRT_AVAILABLE:
+        logger.info(f"Found TensorRT engine {plan_path} but TensorRT/PyCUDA "
+                    "is not installed; falling back to Keras inference")
+        return None
+
+    try:
+        return TRTEngine(plan_path)
+    except Exception as e:
+        logger.warning(f"Failed to load TensorRT engine {plan_path}: {str(e)}")
+        return None
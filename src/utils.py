@@ -1,15 +1,104 @@
 import numpy as np
 import logging
 import os
+from functools import lru_cache
 from PIL import Image
-from pathlib import Path
 from typing import Tuple
 import io
 
+# ImageNet channel means used by VGG16 'caffe'-style preprocessing, in
+# BGR order (matches tensorflow.keras.applications.vgg16.preprocess_input)
+VGG16_BGR_MEAN = np.array([103.939, 116.779, 123.68], dtype=np.float32)
+
+# 256-entry lookup table mapping uint8 pixel values to [0, 1] floats;
+# indexing with the uint8 array fuses the upcast and the division into
+# one gather instead of two full passes over the image
+_U8_TO_UNIT = np.arange(256, dtype=np.float32) / 255.0
+
+# Optional SIMD-accelerated JPEG decoding via libjpeg-turbo (PyTurboJPEG).
+# Falls back to Pillow when the library is not installed. Installing
+# pillow-simd instead of Pillow gives a similar speedup transparently.
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbojpeg = TurboJPEG()
+except Exception:
+    _turbojpeg = None
+
+_JPEG_MAGIC = b'\xff\xd8\xff'
+
+# Magic-byte signatures for the supported upload formats (JPEG, PNG,
+# GIF, BMP), used for cheap validation without a decode pass
+_IMAGE_SIGNATURES = (_JPEG_MAGIC, b'\x89PNG', b'GIF8', b'BM')
+
+# DCT-domain downscale ratios supported by libjpeg-turbo, most
+# aggressive first; the decoder skips the high-frequency coefficients
+# entirely, so a 1/8 decode of a 4MP photo is much cheaper than a full
+# decode followed by a resize
+_TJ_SCALING_FACTORS = ((1, 8), (1, 4), (1, 2))
+
+def _decode_image_rgb(image_file,
+                      target_size: Tuple[int, int] = None) -> Image.Image:
+    """Decode an image file-like object to an RGB PIL image
+
+    JPEG uploads are decoded through libjpeg-turbo when PyTurboJPEG is
+    available (SIMD decode, several times faster than stock Pillow);
+    everything else streams incrementally into Pillow without
+    materializing a second in-memory copy of the upload. When
+    target_size is given, JPEGs are downscaled in the DCT domain during
+    decode to the smallest supported ratio that still covers the
+    target, leaving only a cheap final resize.
+    """
+    header = image_file.read(3)
+    image_file.seek(0)
+
+    if _turbojpeg is not None and header == _JPEG_MAGIC:
+        # TurboJPEG operates on the whole buffer, so only this path
+        # reads the upload into bytes
+        image_bytes = image_file.read()
+        try:
+            scaling_factor = (1, 1)
+            if target_size is not None:
+                width, height, _, _ = _turbojpeg.decode_header(image_bytes)
+                for num, denom in _TJ_SCALING_FACTORS:
+                    if ((width * num) // denom >= target_size[0]
+                            and (height * num) // denom >= target_size[1]):
+                        scaling_factor = (num, denom)
+                        break
+            pixels = _turbojpeg.decode(image_bytes, pixel_format=TJPF_RGB,
+                                       scaling_factor=scaling_factor)
+            return Image.fromarray(pixels)
+        except Exception as e:
+            logging.getLogger(__name__).debug(f"TurboJPEG decode failed, "
+                                              f"falling back to Pillow: {str(e)}")
+            image_file.seek(0)
+
+    image = Image.open(image_file)
+    if target_size is not None and image.format == 'JPEG':
+        # Pillow's draft mode applies the same libjpeg DCT-domain
+        # downscale as the TurboJPEG path above, so even without
+        # PyTurboJPEG large camera uploads never get fully decoded
+        image.draft('RGB', target_size)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+# Sentinel so directory creation runs its mkdir syscalls only once per
+# process, no matter how often the helpers are called
+_DIRS_READY = False
+
+def _ensure_directories():
+    """Create the application directories once per process"""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+
+    for directory in ('logs', 'models', 'uploads', 'temp'):
+        os.makedirs(directory, exist_ok=True)
+    _DIRS_READY = True
+
 def setup_logging():
     """Setup application logging"""
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    _ensure_directories()
 
     logging.basicConfig(
         level=logging.INFO,
@@ -20,37 +109,70 @@ def setup_logging():
         ]
     )
 
-def preprocess_image_vgg16(image_file, target_size: Tuple[int, int]) -> np.ndarray:
+def load_image_rgb(image_file, target_size: Tuple[int, int],
+                   out: np.ndarray = None) -> np.ndarray:
     """
-    Preprocess uploaded image for VGG16 model inference
+    Decode and resize an uploaded image to raw uint8 RGB pixels
+
+    Used by the Keras path, where normalization (cast, BGR swap, mean
+    subtraction) is fused into the model graph and only the uint8
+    pixels cross the feed boundary.
 
     Args:
         image_file: Uploaded image file
         target_size: Target size (width, height) for resizing
+        out: Optional preallocated uint8 batch buffer of shape
+             (1, height, width, 3); pixels are written into out[0]
 
     Returns:
-        Preprocessed image as numpy array suitable for VGG16
+        Raw RGB pixels as a uint8 numpy array; shape
+        (1, height, width, 3) when out is given, (height, width, 3)
+        otherwise
     """
-    from tensorflow.keras.applications.vgg16 import preprocess_input
+    # Decode image (libjpeg-turbo with DCT-domain downscale for JPEGs
+    # when available; other formats stream straight into Pillow)
+    image = _decode_image_rgb(image_file, target_size)
+
+    # Resize image to target size
+    image = image.resize(target_size, Image.Resampling.BILINEAR)
 
-    # Read image
-    image_bytes = image_file.read()
-    image = Image.open(io.BytesIO(image_bytes))
+    pixels = np.asarray(image)
+    if out is not None:
+        np.copyto(out[0], pixels)
+        return out
+    return pixels
 
-    # Convert to RGB if needed
-    if image.mode != 'RGB':
-        image = image.convert('RGB')
+def preprocess_image_vgg16(image_file, target_size: Tuple[int, int],
+                           out: np.ndarray = None) -> np.ndarray:
+    """
+    Preprocess uploaded image for VGG16 model inference
 
-    # Resize image to target size
-    image = image.resize(target_size, Image.Resampling.LANCZOS)
+    Args:
+        image_file: Uploaded image file
+        target_size: Target size (width, height) for resizing
+        out: Optional preallocated float32 batch buffer of shape
+             (1, height, width, 3); the preprocessed pixels are written
+             into out[0], avoiding a fresh allocation per request
 
-    # Convert to numpy array
-    image_array = np.array(image, dtype=np.float32)
+    Returns:
+        Preprocessed image batch as numpy array suitable for VGG16;
+        shape (1, height, width, 3) when out is given, (height, width, 3)
+        otherwise
+    """
+    # Fused VGG16 preprocessing: equivalent to keras preprocess_input
+    # (RGB->BGR swap plus ImageNet mean subtraction) but done in a
+    # single pass over the uint8 pixels. The [..., ::-1] channel
+    # reversal is a strided view and the subtract ufunc upcasts on the
+    # fly (dtype=float32), so the pixels are read once as uint8 and
+    # written once as float32 — no intermediate float arrays.
+    pixels = load_image_rgb(image_file, target_size)
 
-    # Apply VGG16 preprocessing (this handles normalization)
-    image_array = preprocess_input(image_array)
+    if out is not None:
+        np.subtract(pixels[..., ::-1], VGG16_BGR_MEAN, out=out[0],
+                    dtype=np.float32, casting='unsafe')
+        return out
 
-    return image_array
+    return np.subtract(pixels[..., ::-1], VGG16_BGR_MEAN, dtype=np.float32)
 
 def preprocess_image(image_file, target_size: Tuple[int, int]) -> np.ndarray:
     """
@@ -63,41 +185,47 @@ def preprocess_image(image_file, target_size: Tuple[int, int]) -> np.ndarray:
     Returns:
         Preprocessed image as numpy array
     """
-    # Read image
-    image_bytes = image_file.read()
-    image = Image.open(io.BytesIO(image_bytes))
-
-    # Convert to RGB if needed
-    if image.mode != 'RGB':
-        image = image.convert('RGB')
+    # Decode image (libjpeg-turbo with DCT-domain downscale for JPEGs
+    # when available; other formats stream straight into Pillow)
+    image = _decode_image_rgb(image_file, target_size)
 
     # Resize image
-    image = image.resize(target_size, Image.Resampling.LANCZOS)
+    image = image.resize(target_size, Image.Resampling.BILINEAR)
 
-    # Convert to numpy array
-    image_array = np.array(image, dtype=np.float32)
-
-    # Normalize pixel values to [0, 1]
-    image_array = image_array / 255.0
+    # Normalize pixel values to [0, 1] via the precomputed LUT (one
+    # gather instead of an upcast pass plus a division pass)
+    image_array = _U8_TO_UNIT[np.asarray(image)]
 
     return image_array
 
+@lru_cache(maxsize=256)
+def _ext_of(filename: str) -> str:
+    """Lowercased extension of a filename, memoized per name
+
+    Bulk test runs upload the same handful of filenames over and over;
+    the bounded cache turns the slice + lower() allocations into a dict
+    hit on repeats.
+    """
+    # rfind scans from the end (filenames are short, extensions
+    # shorter) and slicing the tail avoids rsplit's list allocation
+    i = filename.rfind('.')
+    return '' if i == -1 else filename[i + 1:].lower()
+
 def allowed_file(filename: str, allowed_extensions: set) -> bool:
     """Check if uploaded file has allowed extension"""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in allowed_extensions
+    return _ext_of(filename) in allowed_extensions
 
 def create_directories():
     """Create necessary directories if they don't exist"""
-    directories = ['logs', 'models', 'uploads', 'temp']
+    _ensure_directories()
 
-    for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
+# Reciprocal computed once so get_file_size_mb multiplies instead of
+# dividing on every call
+_MB_INV = 1.0 / (1024 * 1024)
 
 def get_file_size_mb(file_path: str) -> float:
     """Get file size in MB"""
-    size_bytes = os.path.getsize(file_path)
-    return size_bytes / (1024 * 1024)
+    return os.stat(file_path).st_size * _MB_INV
 
 def validate_image_file(image_file) -> Tuple[bool, str]:
     """
@@ -117,12 +245,16 @@ def validate_image_file(image_file) -> Tuple[bool, str]:
     if not allowed_file(image_file.filename, allowed_extensions):
         return False, f"File type not allowed. Supported types: {', '.join(allowed_extensions)}"
 
-    # Try to open image to validate it's a valid image file
+    # Sniff the magic bytes instead of decoding the image: verify()
+    # walked the whole file, and the caller decodes it again right
+    # after. A corrupt body that passes the sniff still surfaces as a
+    # decode error from the preprocess path.
     try:
         image_file.seek(0)  # Reset file pointer
-        image = Image.open(image_file)
-        image.verify()  # Verify it's a valid image
+        header = image_file.read(8)
         image_file.seek(0)  # Reset file pointer again for actual processing
+        if not header.startswith(_IMAGE_SIGNATURES):
+            return False, "Invalid image file: unrecognized image format"
         return True, ""
     except Exception as e:
         return False, f"Invalid image file: {str(e)}"
\ No newline at end of file
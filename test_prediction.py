@@ -6,32 +6,48 @@ Creates synthetic test images and sends them to the API for prediction
 
 import requests
 import io
-from PIL import Image, ImageDraw
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from PIL import Image
 import numpy as np
 
+# One pooled session for all API calls: keep-alive reuses the TCP
+# connection instead of opening a new one per request
+SESSION = requests.Session()
+
 def create_test_image(color, size=(150, 150), pattern="solid"):
     """Create a synthetic test image"""
-    image = Image.new("RGB", size, color)
+    width, height = size
+    pixels = np.full((height, width, 3), color, dtype=np.uint8)
 
     if pattern == "stripes":
-        draw = ImageDraw.Draw(image)
-        for i in range(0, size[1], 20):
-            draw.rectangle([0, i, size[0], i+10], fill=(255, 255, 255))
+        # White 11px bands every 20 rows, written with one fancy-index
+        # assignment instead of per-stripe draw calls
+        rows = (np.arange(0, height, 20)[:, None] + np.arange(11)).ravel()
+        pixels[rows[rows < height]] = 255
     elif pattern == "spots":
-        draw = ImageDraw.Draw(image)
-        for i in range(0, size[0], 30):
-            for j in range(0, size[1], 30):
-                draw.ellipse([i, j, i+15, j+15], fill=(255, 255, 255))
+        # Blit a single precomputed circular mask at each grid position
+        yy, xx = np.ogrid[:16, :16]
+        spot = (yy - 7.5) ** 2 + (xx - 7.5) ** 2 <= 7.5 ** 2
+        for x in range(0, width, 30):
+            for y in range(0, height, 30):
+                tile = pixels[y:y + 16, x:x + 16]
+                tile[spot[:tile.shape[0], :tile.shape[1]]] = 255
 
-    return image
+    return Image.fromarray(pixels)
 
 def image_to_bytes(image):
     """Convert PIL Image to bytes"""
     img_byte_arr = io.BytesIO()
-    image.save(img_byte_arr, format='PNG')
+    image.save(img_byte_arr, format='BMP')
     img_byte_arr.seek(0)
     return img_byte_arr
 
+@lru_cache(maxsize=None)
+def test_image_bytes(color, size=(150, 150), pattern="solid"):
+    """Build and encode a synthetic test image once per parameter set"""
+    return image_to_bytes(create_test_image(color, size, pattern)).getvalue()
+
 def test_api(api_url="http://localhost:5001"):
     """Test the Flask API with synthetic images"""
 
@@ -41,7 +57,7 @@ def test_api(api_url="http://localhost:5001"):
     # Test health endpoint
     print("\n1. Testing health endpoint...")
     try:
-        response = requests.get(f"{api_url}/health")
+        response = SESSION.get(f"{api_url}/health")
         if response.status_code == 200:
             health_data = response.json()
             print(f"   Status: {health_data['status']}")
@@ -56,7 +72,7 @@ def test_api(api_url="http://localhost:5001"):
     # Test model info endpoint
     print("\n2. Testing model info endpoint...")
     try:
-        response = requests.get(f"{api_url}/model/info")
+        response = SESSION.get(f"{api_url}/model/info")
         if response.status_code == 200:
             model_info = response.json()
             print(f"   Model: {model_info.get('model_name', 'Unknown')}")
@@ -78,43 +94,75 @@ def test_api(api_url="http://localhost:5001"):
 
     print("\n3. Testing predictions with synthetic images...")
 
-    for i, test_case in enumerate(test_cases, 1):
-        print(f"\n   Test {i}: {test_case['name']}")
-
-        # Create test image
-        test_image = create_test_image(test_case['color'])
-        image_bytes = image_to_bytes(test_image)
-
-        try:
-            # Send prediction request
-            files = {"image": ("test_image.png", image_bytes, "image/png")}
-            response = requests.post(f"{api_url}/predict", files=files)
-
-            if response.status_code == 200:
-                result = response.json()
+    def post_prediction(test_case):
+        """Send one prediction request (runs on an executor thread)"""
+        image_bytes = io.BytesIO(test_image_bytes(test_case['color']))
+        files = {"image": ("test_image.bmp", image_bytes, "image/bmp")}
+        return SESSION.post(f"{api_url}/predict", files=files)
+
+    # The requests are independent I/O-bound round-trips, so submit
+    # them all at once; with server-side batching enabled the
+    # concurrent arrivals also coalesce into one forward pass. Results
+    # are printed in order afterwards.
+    with ThreadPoolExecutor(max_workers=len(test_cases)) as executor:
+        futures = [executor.submit(post_prediction, tc) for tc in test_cases]
+
+        for i, (test_case, future) in enumerate(zip(test_cases, futures), 1):
+            print(f"\n   Test {i}: {test_case['name']}")
+
+            try:
+                response = future.result()
+
+                if response.status_code == 200:
+                    result = response.json()
+
+                    if result.get("success"):
+                        top_pred = result["top_prediction"]
+                        print(f"      Prediction: {top_pred['class']}")
+                        print(f"      Confidence: {top_pred['probability']}")
+
+                        # Show all predictions
+                        print("      All predictions:")
+                        for pred in result["predictions"]:
+                            print(f"        {pred['class']}: {pred['probability']}")
+
+                        # Show raw prediction value
+                        if "raw_prediction" in result:
+                            raw_val = result["raw_prediction"]
+                            print(f"      Raw prediction value: {raw_val:.4f}")
+                            print(f"      (Raw >= 0.5 = Cat, Raw < 0.5 = Dog)")
+                    else:
+                        print(f"      Prediction failed: {result.get('error', 'Unknown error')}")
+                else:
+                    print(f"      API request failed: {response.status_code}")
 
-                if result.get("success"):
-                    top_pred = result["top_prediction"]
-                    print(f"      Prediction: {top_pred['class']}")
-                    print(f"      Confidence: {top_pred['probability']}")
+            except Exception as e:
+                print(f"      Prediction error: {e}")
 
-                    # Show all predictions
-                    print("      All predictions:")
-                    for pred in result["predictions"]:
-                        print(f"        {pred['class']}: {pred['probability']}")
+    # Test the raw-tensor fast path: decode happens client-side once and
+    # the uint8 pixels go over the wire as application/octet-stream, so
+    # the server skips the whole image decode/resize pipeline
+    print("\n4. Testing raw-tensor endpoint...")
+    try:
+        # Test images are already built at the model input size (150x150)
+        image = create_test_image((139, 69, 19))
+        response = SESSION.post(
+            f"{api_url}/predict_raw",
+            data=np.asarray(image).tobytes(),
+            headers={"Content-Type": "application/octet-stream"})
 
-                    # Show raw prediction value
-                    if "raw_prediction" in result:
-                        raw_val = result["raw_prediction"]
-                        print(f"      Raw prediction value: {raw_val:.4f}")
-                        print(f"      (Raw >= 0.5 = Cat, Raw < 0.5 = Dog)")
-                else:
-                    print(f"      Prediction failed: {result.get('error', 'Unknown error')}")
+        if response.status_code == 200:
+            result = response.json()
+            if result.get("success"):
+                top_pred = result["top_prediction"]
+                print(f"   Prediction: {top_pred['class']} "
+                      f"({top_pred['probability']})")
             else:
-                print(f"      API request failed: {response.status_code}")
-
-        except Exception as e:
-            print(f"      Prediction error: {e}")
+                print(f"   Raw prediction failed: {result.get('error', 'Unknown error')}")
+        else:
+            print(f"   Raw endpoint request failed: {response.status_code}")
+    except Exception as e:
+        print(f"   Raw endpoint error: {e}")
 
     print("\n" + "=" * 50)
     print("Test completed! The API is working with synthetic images.")
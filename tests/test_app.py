@@ -9,6 +9,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app
+from src.config import Config
 
 @pytest.fixture
 def app():
@@ -22,13 +23,18 @@ def client(app):
     """Create test client"""
     return app.test_client()
 
+# Encoded once and shared by every test that uploads an image
+_TEST_IMAGE_BYTES = None
+
 def create_test_image():
-    """Create a test image for upload testing"""
-    img = Image.new('RGB', (224, 224), color='red')
-    img_io = io.BytesIO()
-    img.save(img_io, 'PNG')
-    img_io.seek(0)
-    return img_io
+    """Create a test image for upload testing (encoded once, reused)"""
+    global _TEST_IMAGE_BYTES
+    if _TEST_IMAGE_BYTES is None:
+        img = Image.new('RGB', (224, 224), color='red')
+        img_io = io.BytesIO()
+        img.save(img_io, 'BMP')
+        _TEST_IMAGE_BYTES = img_io.getvalue()
+    return io.BytesIO(_TEST_IMAGE_BYTES)
 
 def test_health_check(client):
     """Test health check endpoint"""
@@ -66,12 +72,33 @@ def test_predict_valid_image(client):
     test_image = create_test_image()
 
     response = client.post('/predict', data={
-        'image': (test_image, 'test.png')
+        'image': (test_image, 'test.bmp')
     }, content_type='multipart/form-data')
 
     # Note: This test might fail if model is not loaded
     # In a real scenario, you'd mock the model or ensure it's available
     assert response.status_code in [200, 500]  # 500 if model not loaded
 
+def test_predict_raw_wrong_size(client):
+    """Test raw-tensor endpoint with a body of the wrong length"""
+    response = client.post('/predict_raw', data=b'\x00' * 10,
+                           content_type='application/octet-stream')
+    assert response.status_code == 400
+
+    data = json.loads(response.data)
+    assert 'error' in data
+
+def test_predict_raw_valid(client):
+    """Test raw-tensor endpoint with a correctly sized uint8 tensor"""
+    width, height = Config.MODEL_INPUT_SIZE
+    raw_pixels = b'\x80' * (height * width * 3)
+
+    response = client.post('/predict_raw', data=raw_pixels,
+                           content_type='application/octet-stream')
+
+    # Note: This test might fail if model is not loaded
+    # In a real scenario, you'd mock the model or ensure it's available
+    assert response.status_code in [200, 500]  # 500 if model not loaded
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
@@ -6,9 +6,15 @@ Creates synthetic test images and sends them through the API
 
 import requests
 import io
+from functools import lru_cache
 from PIL import Image, ImageDraw
+import numpy as np
 import json
 
+# One pooled session for all API calls: keep-alive reuses the TCP
+# connection instead of opening a new one per request
+SESSION = requests.Session()
+
 def create_synthetic_pet_image(color, size=(150, 150)):
     """Create a synthetic pet-like image"""
     image = Image.new("RGB", size, color)
@@ -19,13 +25,19 @@ def create_synthetic_pet_image(color, size=(150, 150)):
     # Add some oval shapes to simulate pet features
     center_x, center_y = size[0] // 2, size[1] // 2
 
+    # Lightened fills computed once with clipped vector arithmetic
+    # instead of per-channel min() calls
+    color_arr = np.asarray(color, dtype=np.int64)
+    body_fill = tuple(np.minimum(255, color_arr + 20).tolist())
+    head_fill = tuple(np.minimum(255, color_arr + 30).tolist())
+
     # Body oval
     draw.ellipse([center_x - 40, center_y - 20, center_x + 40, center_y + 40],
-                 fill=(min(255, color[0] + 20), min(255, color[1] + 20), min(255, color[2] + 20)))
+                 fill=body_fill)
 
     # Head circle
     draw.ellipse([center_x - 25, center_y - 40, center_x + 25, center_y - 10],
-                 fill=(min(255, color[0] + 30), min(255, color[1] + 30), min(255, color[2] + 30)))
+                 fill=head_fill)
 
     # Eyes
     draw.ellipse([center_x - 15, center_y - 32, center_x - 10, center_y - 27], fill=(0, 0, 0))
@@ -36,10 +48,15 @@ def create_synthetic_pet_image(color, size=(150, 150)):
 def image_to_bytes(image):
     """Convert PIL Image to bytes for API request"""
     img_byte_arr = io.BytesIO()
-    image.save(img_byte_arr, format='PNG')
+    image.save(img_byte_arr, format='BMP')
     img_byte_arr.seek(0)
     return img_byte_arr
 
+@lru_cache(maxsize=None)
+def pet_image_bytes(color, size=(150, 150)):
+    """Build and encode a synthetic pet image once per parameter set"""
+    return image_to_bytes(create_synthetic_pet_image(color, size)).getvalue()
+
 def test_complete_system(api_url="http://localhost:5001"):
     """Test the complete system: Flask API backend"""
 
@@ -49,7 +66,7 @@ def test_complete_system(api_url="http://localhost:5001"):
     # Test 1: Health Check
     print("\n1. Testing Flask API Health Check...")
     try:
-        response = requests.get(f"{api_url}/health", timeout=5)
+        response = SESSION.get(f"{api_url}/health", timeout=5)
         if response.status_code == 200:
             health_data = response.json()
             print(f"   [OK] Status: {health_data['status']}")
@@ -64,7 +81,7 @@ def test_complete_system(api_url="http://localhost:5001"):
     # Test 2: Model Info
     print("\n2. Testing Model Information...")
     try:
-        response = requests.get(f"{api_url}/model/info", timeout=10)
+        response = SESSION.get(f"{api_url}/model/info", timeout=10)
         if response.status_code == 200:
             model_info = response.json()
             print(f"   [OK] Model: {model_info.get('model_name', 'Unknown')}")
@@ -91,14 +108,13 @@ def test_complete_system(api_url="http://localhost:5001"):
     for i, test_case in enumerate(test_cases, 1):
         print(f"\n   Test 3.{i}: {test_case['name']} Image")
 
-        # Create synthetic pet image
-        test_image = create_synthetic_pet_image(test_case['color'])
-        image_bytes = image_to_bytes(test_image)
+        # Build the synthetic pet image bytes (cached across repeat runs)
+        image_bytes = io.BytesIO(pet_image_bytes(test_case['color']))
 
         try:
             # Send prediction request
-            files = {"image": ("test_pet.png", image_bytes, "image/png")}
-            response = requests.post(f"{api_url}/predict", files=files, timeout=30)
+            files = {"image": ("test_pet.bmp", image_bytes, "image/bmp")}
+            response = SESSION.post(f"{api_url}/predict", files=files, timeout=30)
 
             if response.status_code == 200:
                 result = response.json()
@@ -134,7 +150,7 @@ def test_complete_system(api_url="http://localhost:5001"):
         # Send an invalid file
         invalid_data = b"This is not an image file"
         files = {"image": ("invalid.txt", io.BytesIO(invalid_data), "text/plain")}
-        response = requests.post(f"{api_url}/predict", files=files, timeout=10)
+        response = SESSION.post(f"{api_url}/predict", files=files, timeout=10)
 
         if response.status_code == 400:
             print("   [OK] Properly handles invalid image files")